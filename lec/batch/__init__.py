@@ -0,0 +1 @@
+from .pipeline import readManifest, ResultStore, runPipeline
\ No newline at end of file
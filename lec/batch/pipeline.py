@@ -0,0 +1,280 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# pipeline.py
+
+
+import os
+import re
+import sys
+import glob
+import json
+import hashlib
+import argparse
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+
+def readManifest(manifestFile: str) -> List[Dict]:
+    """
+    ### Expand a manifest into the list of cases.
+        The manifest is a json list, each entry reads
+        `{"file": "wout_*.nc", "surfaces": [-1], "iota": [0.4, 0.5], "aveJacobian": 1.0}`.
+        `file` may be a glob pattern relative to the manifest, `input.*` namelists ignore `surfaces`.
+    Args:
+        manifestFile: the path of the manifest.
+    Returns:
+        a list of cases, each case is a dict with keys `key`, `file`, `surfaceIndex`, `iota`, `aveJacobian`.
+        The cases listed more than once are kept only once.
+    """
+    try:
+        with open(manifestFile, "r") as f:
+            entries = json.load(f)
+    except OSError:
+        raise FileNotFoundError(
+            "Cannot open " + manifestFile + "..."
+        )
+    baseDir = os.path.dirname(os.path.abspath(manifestFile))
+    cases = dict()
+    for entry in entries:
+        pattern = os.path.join(baseDir, entry["file"])
+        files = sorted(glob.glob(pattern))
+        if len(files) == 0:
+            raise FileNotFoundError(
+                "No file matches " + pattern + "..."
+            )
+        iotaList = np.atleast_1d(entry["iota"]).tolist()
+        aveJacobian = float(entry.get("aveJacobian", 1.0))
+        for file in files:
+            if isVMECOutput(file):
+                surfaces = np.atleast_1d(entry.get("surfaces", -1)).tolist()
+            else:
+                surfaces = [-1]
+            for surfaceIndex in surfaces:
+                for iota in iotaList:
+                    key = caseKey(os.path.relpath(file, baseDir), int(surfaceIndex), float(iota), aveJacobian)
+                    cases.setdefault(key, {
+                        "key": key,
+                        "file": file,
+                        "surfaceIndex": int(surfaceIndex),
+                        "iota": float(iota),
+                        "aveJacobian": aveJacobian
+                    })
+    return list(cases.values())
+
+
+def isVMECOutput(file: str) -> bool:
+    name = os.path.basename(file)
+    return name.startswith("wout") or name.endswith(".nc")
+
+
+def caseKey(file: str, surfaceIndex: int, iota: float, aveJacobian: float=1.0) -> str:
+    """
+    The key is used both as the group name in the store and as the record in the checkpoint.
+        The readable part is sanitized, so a hash of the exact case is appended to keep the keys unique.
+    """
+    label = "{:s}_s{:d}_iota{:.10g}_J{:.10g}".format(os.path.basename(file), surfaceIndex, iota, aveJacobian)
+    digest = hashlib.sha1(repr((file, surfaceIndex, iota, aveJacobian)).encode()).hexdigest()[:8]
+    return "case_" + re.sub(r"[^0-9A-Za-z_.+-]", "_", label) + "_" + digest
+
+
+def solveCase(case: Dict, ntheta: int=0, nzeta: int=0) -> Dict:
+    """
+    ### Solve one case, this function runs in the worker processes.
+    Args:
+        case: one of the cases given by `readManifest`.
+        ntheta, nzeta: the odd numbers of samples used to get the spectrum of |B|,
+            `0` means twice the resolution of the Jacobian, as B^2 = J^2 g has at least twice its bandwidth.
+    Returns:
+        a dict of the Fourier coefficients of the Jacobian and |B|,
+        the spectrum of |B| is a truncation to `mpol = (ntheta-1)//2`, `ntor = (nzeta-1)//2`.
+    """
+    if ntheta % 2 == 0 and ntheta != 0 or nzeta % 2 == 0 and nzeta != 0:
+        raise ValueError(
+            "The numbers of samples of |B| should be odd... "
+        )
+    from ..geometry import Surface
+    from ..solver import SurfaceEquilibrium
+    from ..toroidalField import fftToroidalField
+    if isVMECOutput(case["file"]):
+        surf = Surface.readVMECOutput(case["file"], surfaceIndex=case["surfaceIndex"])
+    else:
+        surf = Surface.readVMECInput(case["file"])
+    equilibrium = SurfaceEquilibrium(surf, iota=case["iota"], aveJacobian=case["aveJacobian"])
+    equilibrium.run()
+    jacobian = equilibrium.Jacobian
+    ntheta = ntheta or 2*(2*jacobian.mpol)+1
+    nzeta = nzeta or 2*(2*jacobian.ntor)+1
+    sampleTheta = np.arange(ntheta) * 2*np.pi/ntheta
+    sampleZeta = np.arange(nzeta) * 2*np.pi/equilibrium.nfp/nzeta
+    gridSampleZeta, gridSampleTheta = np.meshgrid(sampleZeta, sampleTheta)
+    # fftToroidalField takes the samples on (theta, -zeta)
+    sampleB = equilibrium.getB(gridSampleTheta, -gridSampleZeta)
+    fieldB = fftToroidalField(sampleB, nfp=equilibrium.nfp)
+    return {
+        "nfp": equilibrium.nfp,
+        "jacobianMpol": jacobian.mpol,
+        "jacobianNtor": jacobian.ntor,
+        "jacobianXm": jacobian.xm,
+        "jacobianXn": jacobian.xn,
+        "jacobianRe": jacobian.reArr,
+        "jacobianIm": jacobian.imArr,
+        "bMpol": fieldB.mpol,
+        "bNtor": fieldB.ntor,
+        "bXm": fieldB.xm,
+        "bXn": fieldB.xn,
+        "bRe": fieldB.reArr,
+        "bIm": fieldB.imArr
+    }
+
+
+class ResultStore:
+    """
+    ### The appendable netCDF/HDF5 store of the results.
+        Each case is written to its own group as soon as it is done,
+        and its key is appended to the checkpoint file `store + ".done"` afterwards.
+        The cases failed in the latest run are recorded in `store + ".failed"`.
+    """
+
+    def __init__(self, storeFile: str, engine: str=None) -> None:
+        self.storeFile = storeFile
+        self.checkpointFile = storeFile + ".done"
+        self.failureFile = storeFile + ".failed"
+        self.engine = engine
+
+    def finishedKeys(self) -> Set[str]:
+        if not os.path.exists(self.checkpointFile):
+            return set()
+        with open(self.checkpointFile, "r") as f:
+            return set(line.strip() for line in f if line.strip())
+
+    def write(self, case: Dict, result: Dict) -> None:
+        import xarray
+        dataset = xarray.Dataset(
+            data_vars = {
+                "jacobian_re": ("jacobian_mode", result["jacobianRe"]),
+                "jacobian_im": ("jacobian_mode", result["jacobianIm"]),
+                "b_re": ("b_mode", result["bRe"]),
+                "b_im": ("b_mode", result["bIm"])
+            },
+            coords = {
+                "jacobian_xm": ("jacobian_mode", result["jacobianXm"]),
+                "jacobian_xn": ("jacobian_mode", result["jacobianXn"]),
+                "b_xm": ("b_mode", result["bXm"]),
+                "b_xn": ("b_mode", result["bXn"])
+            },
+            attrs = {
+                "file": case["file"],
+                "surfaceIndex": case["surfaceIndex"],
+                "iota": case["iota"],
+                "aveJacobian": case["aveJacobian"],
+                "nfp": result["nfp"],
+                "jacobianMpol": result["jacobianMpol"],
+                "jacobianNtor": result["jacobianNtor"],
+                "bMpol": result["bMpol"],
+                "bNtor": result["bNtor"]
+            }
+        )
+        # a group left behind by an interrupted run is overwritten in mode "a"
+        mode = "a" if os.path.exists(self.storeFile) else "w"
+        dataset.to_netcdf(self.storeFile, mode=mode, group=case["key"], engine=self.engine)
+        with open(self.checkpointFile, "a") as f:
+            f.write(case["key"] + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    def clearFailures(self) -> None:
+        if os.path.exists(self.failureFile):
+            os.remove(self.failureFile)
+
+    def fail(self, case: Dict, error: BaseException) -> None:
+        with open(self.failureFile, "a") as f:
+            f.write("{:s}\t{:s}\t{:s}\n".format(
+                case["key"], case["file"], repr(error).replace("\n", " ")
+            ))
+
+
+def runPipeline(cases: List[Dict], store: ResultStore, maxWorkers: int=None, ntheta: int=0, nzeta: int=0) -> Iterator[Tuple[Dict, Optional[Exception]]]:
+    """
+    ### Solve the cases with a bounded worker pool and stream the results into the store.
+        At most `2*maxWorkers` cases are in flight, the finished cases in the checkpoint are skipped.
+        A failed case is recorded by the store and the others go on, it is retried in the next run.
+    Args:
+        cases: the cases given by `readManifest`.
+        store: the (class)ResultStore.
+        maxWorkers: the number of worker processes, `None` means the number of cpus.
+        ntheta, nzeta: the number of samples used to get the spectrum of |B|.
+    Yields:
+        `(case, error)`, `error` is `None` if the case has been written into the store.
+    """
+    store.clearFailures()
+    finished = store.finishedKeys()
+    pending = iter([case for case in cases if case["key"] not in finished])
+    maxWorkers = maxWorkers or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=maxWorkers) as executor:
+        inFlight = dict()
+        try:
+            while True:
+                while len(inFlight) < 2*maxWorkers:
+                    case = next(pending, None)
+                    if case is None:
+                        break
+                    inFlight[executor.submit(solveCase, case, ntheta, nzeta)] = case
+                if len(inFlight) == 0:
+                    break
+                done, _ = wait(inFlight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    case = inFlight.pop(future)
+                    try:
+                        store.write(case, future.result())
+                    except Exception as error:
+                        store.fail(case, error)
+                        yield case, error
+                    else:
+                        yield case, None
+        except BaseException:
+            for future in inFlight:
+                future.cancel()
+            raise
+
+
+def oddSamples(value: str) -> int:
+    nums = int(value)
+    if nums < 0 or nums % 2 == 0 and nums != 0:
+        raise argparse.ArgumentTypeError(
+            "should be a positive odd number or 0, got " + value
+        )
+    return nums
+
+
+def main(argv: List[str]=None) -> None:
+    parser = argparse.ArgumentParser(
+        prog = "lec-batch",
+        description = "Solve the local equilibria of many surfaces and stream the results into a netCDF/HDF5 store. "
+    )
+    parser.add_argument("manifest", help="the json manifest of files, surfaces and iota values")
+    parser.add_argument("store", help="the netCDF/HDF5 file the results are appended to")
+    parser.add_argument("-j", "--workers", type=int, default=None, help="the number of worker processes")
+    parser.add_argument("--ntheta", type=oddSamples, default=0, help="the odd number of poloidal samples of |B|, 0 means twice the resolution of the Jacobian")
+    parser.add_argument("--nzeta", type=oddSamples, default=0, help="the odd number of toroidal samples of |B| in one period, 0 means twice the resolution of the Jacobian")
+    parser.add_argument("--engine", default=None, help="the xarray backend, e.g. netcdf4 or h5netcdf")
+    args = parser.parse_args(argv)
+    cases = readManifest(args.manifest)
+    store = ResultStore(args.store, engine=args.engine)
+    nums = len(cases)
+    skipped = len(store.finishedKeys() & set(case["key"] for case in cases))
+    print("{:d} cases, {:d} finished before... ".format(nums, skipped))
+    failures = 0
+    for i, (case, error) in enumerate(runPipeline(cases, store, args.workers, args.ntheta, args.nzeta)):
+        if error is None:
+            print("[{:d}/{:d}] {:s}".format(skipped+i+1, nums, case["key"]))
+        else:
+            failures += 1
+            print("[{:d}/{:d}] {:s} failed: {:s}".format(skipped+i+1, nums, case["key"], repr(error)))
+    if failures:
+        print("{:d} cases failed, see {:s}".format(failures, store.failureFile))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
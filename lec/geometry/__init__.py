@@ -1 +1,2 @@
-from .surface import Surface
\ No newline at end of file
+from .surface import Surface
+from .grid import SurfaceGrid
\ No newline at end of file
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# grid.py
+
+
+import numpy as np
+from functools import cached_property
+from ..toroidalField import ToroidalField
+from ..toroidalField import derivatePol, derivateTor, ifftToroidalField
+
+
+class SurfaceGrid:
+    r"""
+    ## The geometry of the surface $R(\theta,\varphi)$, $Z(\theta,\varphi)$ on a uniform grid.
+        All the arrays are of the shape `(ntheta, nzeta)`, the endpoints $2\pi$ are excluded.
+        The derived quantities are computed once on the first access.
+        The cross-section at $\varphi$ = `zetaArr[k]` is given by `r[:,k]`, `z[:,k]`.
+    """
+
+    def __init__(self, rField: ToroidalField, zField: ToroidalField, ntheta: int=128, nzeta: int=128, onePeriod: bool=True) -> None:
+        """
+        ### Evaluate R, Z and their first derivatives by one batched inverse fft.
+        Args:
+            rField, zField: the Fourier representation of R and Z.
+            ntheta, nzeta: the number of grid points in the poloidal/toroidal direction.
+            onePeriod: only evaluate the surface in one field period.
+        """
+        self.nfp = rField.nfp
+        self.onePeriod = onePeriod
+        self.thetaArr = np.arange(ntheta) * 2*np.pi/ntheta
+        if onePeriod:
+            self.zetaArr = np.arange(nzeta) * 2*np.pi/self.nfp/nzeta
+        else:
+            self.zetaArr = np.arange(nzeta) * 2*np.pi/nzeta
+        (
+            self.r, self.z,
+            self.dRdTheta, self.dRdPhi,
+            self.dZdTheta, self.dZdPhi
+        ) = ifftToroidalField(
+            [rField, zField, derivatePol(rField), derivateTor(rField), derivatePol(zField), derivateTor(zField)],
+            ntheta, nzeta, onePeriod
+        )
+
+    @cached_property
+    def thetaGrid(self) -> np.ndarray:
+        return np.broadcast_to(self.thetaArr.reshape(-1,1), self.r.shape)
+
+    @cached_property
+    def zetaGrid(self) -> np.ndarray:
+        return np.broadcast_to(self.zetaArr.reshape(1,-1), self.r.shape)
+
+    @cached_property
+    def cosZeta(self) -> np.ndarray:
+        return np.cos(self.zetaArr).reshape(1,-1)
+
+    @cached_property
+    def sinZeta(self) -> np.ndarray:
+        return np.sin(self.zetaArr).reshape(1,-1)
+
+    @cached_property
+    def x(self) -> np.ndarray:
+        return self.r * self.cosZeta
+
+    @cached_property
+    def y(self) -> np.ndarray:
+        return self.r * self.sinZeta
+
+    @cached_property
+    def crossCylindrical(self) -> np.ndarray:
+        r"""
+        $\frac{\partial\mathbf{x}}{\partial\theta}\times\frac{\partial\mathbf{x}}{\partial\varphi}$ in the components $(R, \varphi, Z)$,
+            `shape = (3, ntheta, nzeta)`
+        """
+        return np.array([
+            - self.r*self.dZdTheta,
+            self.dRdPhi*self.dZdTheta - self.dRdTheta*self.dZdPhi,
+            self.r*self.dRdTheta
+        ])
+
+    @cached_property
+    def areaElement(self) -> np.ndarray:
+        r"""
+        $|\frac{\partial\mathbf{x}}{\partial\theta}\times\frac{\partial\mathbf{x}}{\partial\varphi}|$
+        """
+        return np.linalg.norm(self.crossCylindrical, axis=0)
+
+    @cached_property
+    def normal(self) -> np.ndarray:
+        """
+        The unit normal vector along `crossCylindrical` in the components (x, y, z), `shape = (3, ntheta, nzeta)`
+        """
+        nR, nPhi, nZ = self.crossCylindrical / self.areaElement
+        return np.array([
+            nR*self.cosZeta - nPhi*self.sinZeta,
+            nR*self.sinZeta + nPhi*self.cosZeta,
+            nZ
+        ])
+
+    @cached_property
+    def area(self) -> float:
+        """
+        The area of the whole surface.
+        """
+        return 4*np.pi*np.pi * np.mean(self.areaElement)
+
+    @cached_property
+    def volume(self) -> float:
+        r"""
+        The enclosed volume, $V = \frac{1}{3}\oint\mathbf{x}\cdot\mathrm{d}\mathbf{S}$.
+        """
+        nR, _, nZ = self.crossCylindrical
+        return abs(4*np.pi*np.pi/3 * np.mean(self.r*nR + self.z*nZ))
+
+
+if __name__ == "__main__":
+    pass
@@ -7,6 +7,7 @@ import numpy as np
 from typing import Tuple
 from ..toroidalField import ToroidalField
 from ..toroidalField import derivatePol, derivateTor 
+from .grid import SurfaceGrid
 
 
 class Surface:
@@ -38,6 +39,17 @@ class Surface:
         g_phiphi = self.dRdPhi*self.dRdPhi + self.r*self.r + self.dZdPhi*self.dZdPhi
         return g_thetatheta, g_thetaphi, g_phiphi
 
+    def getGrid(self, ntheta: int=128, nzeta: int=128, onePeriod: bool=True) -> SurfaceGrid:
+        """
+        ### Get R, Z, their derivatives, the normal vector, the area and the volume on a uniform grid. 
+        Args:
+            ntheta, nzeta: the number of grid points in the poloidal/toroidal direction. 
+            onePeriod: only evaluate the surface in one field period. 
+        Returns:
+            (class)SurfaceGrid
+        """
+        return SurfaceGrid(self.r, self.z, ntheta=ntheta, nzeta=nzeta, onePeriod=onePeriod)
+
     # fileio ##################################################################
     # TODO: read surface form booz_xform
     @classmethod
@@ -49,7 +49,7 @@ class SurfaceEquilibrium:
         g_phiphiGrid = self.g_phiphi.getValue(thetaArr, zetaArr)
         B2Grid = (
             np.power(JacobianGrid, 2) *
-            (g_phiphiGrid + 2*self.iota*g_thetaphiGrid + self.iota*self.iota*g_thetaphiGrid)
+            (g_phiphiGrid + 2*self.iota*g_thetaphiGrid + self.iota*self.iota*g_thetathetaGrid)
         )
         return np.power(B2Grid, 0.5)
 
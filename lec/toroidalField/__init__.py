@@ -1,4 +1,4 @@
 from .field import ToroidalField
-from .sample import fftToroidalField
+from .sample import fftToroidalField, ifftToroidalField
 from .derivative import derivatePol, derivateTor
 from .misc import changeResolution
\ No newline at end of file
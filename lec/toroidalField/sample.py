@@ -5,6 +5,7 @@
 
 import numpy as np
 from scipy import fft
+from typing import List
 from .field import ToroidalField
 
 
@@ -28,6 +29,30 @@ def fftToroidalField(sampleValue: np.ndarray, nfp: int=1) -> ToroidalField:
     )
 
 
+def ifftToroidalField(fields: List[ToroidalField], ntheta: int, nzeta: int, onePeriod: bool=True) -> np.ndarray:
+    r"""
+    ### Evaluate several toroidal fields on a uniform grid by one batched inverse fft. 
+        $\theta_j = 2\pi j/N_\theta$, $\varphi_k = 2\pi k/(N_{fp}N_\varphi)$ if `onePeriod` else $2\pi k/N_\varphi$, 
+        the endpoints $2\pi$ are excluded. 
+    Args:
+        fields: the fields, which should have the same nfp. 
+        ntheta, nzeta: the number of grid points in the poloidal/toroidal direction. 
+        onePeriod: only evaluate the fields in one field period. 
+    Returns:
+        the values, `valueArr.shape = (len(fields), ntheta, nzeta)`
+    """
+    spectrum = np.zeros((len(fields), ntheta, nzeta), dtype=complex)
+    for i, field in enumerate(fields):
+        nfp = 1 if onePeriod else field.nfp
+        thetaIndex = field.xm % ntheta
+        zetaIndex = (-nfp*field.xn) % nzeta
+        np.add.at(spectrum[i], (thetaIndex, zetaIndex), field.reArr + 1j*field.imArr)
+    valueArr = 2 * fft.ifft2(spectrum, axes=(-2,-1), norm="forward").real
+    for i, field in enumerate(fields):
+        valueArr[i] -= field.reArr[0]
+    return valueArr
+
+
 # def fftToroidalField_toroidalReversed(sampleValue: np.ndarray, nfp: int=1) -> ToroidalField:
 #     """
 #     This function cannot be trusted... 
@@ -1,7 +1,7 @@
 import setuptools
 from lec import __version__
 
-with open("readme.md", "r") as fh:
+with open("README.md", "r") as fh:
     long_description = fh.read()
 
 setuptools.setup(
@@ -21,5 +21,8 @@ setuptools.setup(
     author_email="lk2020@mail.ustc.edu.cn",
     license="GNU 3.0",
     packages=setuptools.find_packages(),
+    entry_points={
+        "console_scripts": ["lec-batch = lec.batch.pipeline:main"],
+    },
 )
 
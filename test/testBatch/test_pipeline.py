@@ -0,0 +1,51 @@
+import os
+import json
+import shutil
+import pytest
+from lec.batch import readManifest, ResultStore, runPipeline
+
+
+testFieldDir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "testField")
+
+
+def writeManifest(path, entries):
+    with open(path, "w") as f:
+        json.dump(entries, f)
+    return str(path)
+
+
+def test_manifest_keys(tmp_path):
+    shutil.copy(os.path.join(testFieldDir, "input.DIII-D"), tmp_path)
+    (tmp_path / "sub").mkdir()
+    manifest = writeManifest(tmp_path / "sub" / "manifest.json", [
+        {"file": "../input.DIII-D", "iota": [0.4, 0.5]},
+        {"file": "../input.DIII-D", "iota": [0.4], "aveJacobian": 2.0},
+        {"file": "../input.DIII-D", "iota": 0.5}
+    ])
+    cases = readManifest(manifest)
+    assert len(cases) == 3
+    assert len(set(case["key"] for case in cases)) == 3
+    assert all(case["key"].startswith("case_") for case in cases)
+
+
+def test_resume(tmp_path):
+    shutil.copy(os.path.join(testFieldDir, "input.DIII-D"), tmp_path)
+    (tmp_path / "input.bad").write_text("not a namelist")
+    manifest = writeManifest(tmp_path / "manifest.json", [
+        {"file": "input.DIII-D", "iota": [0.4, 0.5]},
+        {"file": "input.bad", "iota": 0.4}
+    ])
+    cases = readManifest(manifest)
+    store = ResultStore(str(tmp_path / "store.nc"))
+    results = list(runPipeline(cases, store, maxWorkers=2))
+    assert len(results) == 3
+    assert sum(error is not None for _, error in results) == 1
+    assert len(store.finishedKeys()) == 2
+    assert os.path.exists(store.failureFile)
+    rerun = list(runPipeline(cases, store, maxWorkers=2))
+    assert [case["key"] for case, _ in rerun] == [cases[2]["key"]]
+    assert list(runPipeline(cases[:2], store, maxWorkers=2)) == []
+    import xarray
+    dataset = xarray.open_dataset(store.storeFile, group=cases[0]["key"])
+    assert dataset.attrs["iota"] == pytest.approx(0.4)
+    dataset.close()
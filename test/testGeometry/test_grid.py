@@ -0,0 +1,32 @@
+import os
+import numpy as np
+import pytest
+from lec.geometry import Surface
+from lec.toroidalField import ToroidalField
+
+
+testFieldDir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "testField")
+
+
+@pytest.mark.parametrize("inputFile", ["input.DIII-D", "input.QAS", "input.heliotron"])
+@pytest.mark.parametrize("onePeriod", [True, False])
+def test_grid_values(inputFile, onePeriod):
+    surf = Surface.readVMECInput(os.path.join(testFieldDir, inputFile))
+    grid = surf.getGrid(ntheta=24, nzeta=20, onePeriod=onePeriod)
+    thetaGrid, zetaGrid = np.array(grid.thetaGrid), np.array(grid.zetaGrid)
+    for value, field in [
+        (grid.r, surf.r), (grid.z, surf.z),
+        (grid.dRdTheta, surf.dRdTheta), (grid.dRdPhi, surf.dRdPhi),
+        (grid.dZdTheta, surf.dZdTheta), (grid.dZdPhi, surf.dZdPhi)
+    ]:
+        assert np.allclose(value, field.getValue(thetaGrid, zetaGrid), atol=1e-12)
+
+
+def test_torus():
+    r0, a = 3.0, 1.0
+    rField = ToroidalField(nfp=1, mpol=1, ntor=0, reArr=np.array([r0, a/2]), imArr=np.zeros(2))
+    zField = ToroidalField(nfp=1, mpol=1, ntor=0, reArr=np.zeros(2), imArr=np.array([0, -a/2]))
+    grid = Surface(rField, zField).getGrid(ntheta=32, nzeta=8, onePeriod=False)
+    assert grid.area == pytest.approx(4*np.pi*np.pi*r0*a)
+    assert grid.volume == pytest.approx(2*np.pi*np.pi*r0*a*a)
+    assert np.allclose(np.linalg.norm(grid.normal, axis=0), 1)
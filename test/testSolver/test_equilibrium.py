@@ -0,0 +1,21 @@
+import os
+import numpy as np
+from lec.geometry import Surface
+from lec.solver import SurfaceEquilibrium
+
+
+testFieldDir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "testField")
+
+
+def test_getB():
+    surf = Surface.readVMECInput(os.path.join(testFieldDir, "input.DIII-D"))
+    iota = 0.4
+    equilibrium = SurfaceEquilibrium(surf, iota=iota)
+    equilibrium.run()
+    thetaGrid, zetaGrid = np.meshgrid(np.linspace(0, 2*np.pi, 17), np.linspace(0, 2*np.pi, 9))
+    J = equilibrium.Jacobian.getValue(thetaGrid, zetaGrid)
+    g_thetatheta = equilibrium.g_thetatheta.getValue(thetaGrid, zetaGrid)
+    g_thetaphi = equilibrium.g_thetaphi.getValue(thetaGrid, zetaGrid)
+    g_phiphi = equilibrium.g_phiphi.getValue(thetaGrid, zetaGrid)
+    B = np.sqrt(J*J*(g_phiphi + 2*iota*g_thetaphi + iota*iota*g_thetatheta))
+    assert np.allclose(equilibrium.getB(thetaGrid, zetaGrid), B)